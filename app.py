@@ -1,31 +1,75 @@
+import hmac
 import os
+import secrets
+import sqlite3
+import threading
+import time
 from datetime import datetime
+from functools import wraps
+from urllib.parse import quote
 from flask import (
     Flask,
+    Response,
+    abort,
     render_template,
     request,
     redirect,
     url_for,
     flash,
+    jsonify,
     session,
     send_from_directory,
 )
+from werkzeug.exceptions import InternalServerError, NotFound
+from werkzeug.security import check_password_hash, generate_password_hash, safe_join
 from werkzeug.utils import secure_filename
+import redis
+from flask_caching import Cache
+from flask_session import Session
+from rq import Queue
 from flask_sqlalchemy import SQLAlchemy
+from PIL import Image
+from sqlalchemy import event, insert, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.orm import joinedload
+
+from tasks import process_image
 
 # Configuration
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 UPLOAD_FOLDER = os.path.join(BASE_DIR, 'static', 'uploads')
+# raw uploads wait here (not web-served) until the image worker publishes them
+UPLOAD_STAGING_FOLDER = os.path.join(BASE_DIR, 'uploads_staging')
 DB_PATH = os.path.join(BASE_DIR, 'app.db')
 
 app = Flask(__name__)
 # Read config from environment for production readiness
 app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///' + DB_PATH)
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# Each concurrent gevent request holds its own connection, so the default pool of 5
+# would queue requests. SQLite keeps SQLAlchemy's defaults (one writer at a time anyway).
+if not app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite'):
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 20)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 40)),
+        'pool_pre_ping': True,
+        'pool_recycle': 1800,
+    }
+    if app.config['SQLALCHEMY_DATABASE_URI'].startswith('postgres'):
+        app.config['SQLALCHEMY_ENGINE_OPTIONS']['connect_args'] = {'connect_timeout': 5}
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
+app.config['UPLOAD_STAGING_FOLDER'] = UPLOAD_STAGING_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16 MB upload limit
+# Internal nginx location for uploads (e.g. '/_uploads/'); unset serves them from Flask
+app.config['UPLOADS_ACCEL_REDIRECT'] = os.environ.get('UPLOADS_ACCEL_REDIRECT')
 app.secret_key = os.environ.get('FLASK_SECRET', 'dev_secret_key')
 
+# Editor credentials are read once at startup; only a hash of the password is kept
+EDITOR_USER = os.environ.get('EDITOR_USER', 'editor')
+EDITOR_PASS_HASH = generate_password_hash(os.environ.get('EDITOR_PASS', 'password'))
+
 # Security: trust proxy headers (e.g. Cloudflare, nginx). If you have an additional
 # proxy in front of the app, increase the x_for/x_proto counts accordingly.
 from werkzeug.middleware.proxy_fix import ProxyFix
@@ -48,6 +92,57 @@ except Exception:
 db = SQLAlchemy(app)
 
 
+@event.listens_for(Engine, 'connect')
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL lets readers run while a post is being written; NORMAL sync is safe under WAL
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL;')
+    cursor.execute('PRAGMA synchronous=NORMAL;')
+    cursor.execute('PRAGMA temp_store=MEMORY;')
+    cursor.execute('PRAGMA mmap_size=268435456;')  # 256 MB
+    cursor.execute('PRAGMA cache_size=-64000;')  # ~64 MB
+    cursor.close()
+
+
+# Page cache for read-mostly views, shared by all gunicorn workers through Redis.
+# Without REDIS_URL caching is off: a per-process cache would only be cleared in the
+# worker that handled a write, and the others would keep serving stale pages.
+REDIS_URL = os.environ.get('REDIS_URL')
+if REDIS_URL:
+    app.config['CACHE_TYPE'] = 'RedisCache'
+    app.config['CACHE_REDIS_URL'] = REDIS_URL
+else:
+    app.config['CACHE_TYPE'] = 'NullCache'
+    app.config['CACHE_NO_NULL_WARNING'] = True
+app.config['CACHE_DEFAULT_TIMEOUT'] = 300
+app.config['CACHE_KEY_PREFIX'] = 'birdblog:'
+cache = Cache(app)
+
+# Server-side sessions in Redis: the cookie only carries a session id, and logout
+# invalidates the session on the server. Without Redis keep signed cookie sessions.
+redis_client = redis.from_url(REDIS_URL) if REDIS_URL else None
+if REDIS_URL:
+    app.config['SESSION_TYPE'] = 'redis'
+    app.config['SESSION_REDIS'] = redis_client
+    app.config['SESSION_PERMANENT'] = False
+    Session(app)
+
+# Image post-processing (resize, EXIF strip) runs on an RQ worker so uploads return
+# as soon as the raw file is staged; the worker publishes the cleaned image.
+# Without Redis images are stored as uploaded.
+image_queue = Queue('images', connection=redis_client) if REDIS_URL else None
+
+# Optional: nplusone (requirements-dev.txt) flags lazy loads that cause N+1 queries
+try:
+    from nplusone.ext.flask_sqlalchemy import NPlusOne
+    NPlusOne(app)
+except Exception:
+    # nplusone is a development aid only; production installs skip it
+    pass
+
+
 class Species(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(128), unique=True, nullable=False)
@@ -63,6 +158,11 @@ class Animal(db.Model):
 
     species = db.relationship('Species', backref=db.backref('animals', lazy=True))
 
+    __table_args__ = (
+        # one animal name per species; also serves lookups by (species_id, name)
+        db.Index('uq_animal_species_name', 'species_id', 'name', unique=True),
+    )
+
     def __repr__(self):
         return f"<Animal {self.name} ({self.species.name})>"
 
@@ -82,7 +182,7 @@ class Post(db.Model):
     animal_name = db.Column(db.String(100))
     notes = db.Column(db.Text)
     image_filename = db.Column(db.String(300), nullable=False)
-    timestamp = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    timestamp = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
     species_id = db.Column(db.Integer, db.ForeignKey('species.id'), nullable=False)
     # nullable user_id - safe migration will add column if DB created earlier
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'))
@@ -90,50 +190,129 @@ class Post(db.Model):
     species = db.relationship('Species', backref=db.backref('posts', lazy=True))
     user = db.relationship('User', backref=db.backref('posts', lazy=True))
 
+    __table_args__ = (
+        # per-species feed: WHERE species_id = ? ORDER BY timestamp DESC
+        db.Index('ix_post_species_ts', 'species_id', 'timestamp'),
+    )
+
     def __repr__(self):
         return f"<Post {self.id} {self.caption[:20]}>"
 
 
+# built once at import; species change rarely, so the rows are memoized too and
+# dropped by the cache.clear() in every write view
+_SPECIES_ALL_STMT = select(Species.id, Species.name).order_by(Species.name)
+
+
+@cache.memoize(60)
+def get_species_list():
+    """Plain (id, name) rows, not ORM objects, so they survive pickling into the cache."""
+    return db.session.execute(_SPECIES_ALL_STMT).all()
+
+
+def insert_unless_exists(model, index_elements, **values):
+    """INSERT ... ON CONFLICT DO NOTHING in one round-trip.
+
+    Returns the new row's id, or None if a row with the same unique key exists.
+    Other databases get a plain INSERT in a savepoint and a caught IntegrityError.
+    """
+    dialect_insert = {'postgresql': postgresql.insert, 'sqlite': sqlite.insert}.get(db.engine.dialect.name)
+    if dialect_insert is None:
+        try:
+            with db.session.begin_nested():
+                result = db.session.execute(insert(model).values(**values))
+        except IntegrityError:
+            return None
+        return result.inserted_primary_key[0]
+    stmt = (
+        dialect_insert(model)
+        .values(**values)
+        .on_conflict_do_nothing(index_elements=index_elements)
+        .returning(model.id)
+    )
+    return db.session.execute(stmt).scalar()
+
+
 def ensure_app_dirs():
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+    os.makedirs(app.config['UPLOAD_STAGING_FOLDER'], exist_ok=True)
+
+
+def remove_upload(filename):
+    """Delete an uploaded image, logging instead of raising on failure."""
+    folders = [app.config['UPLOAD_FOLDER']]
+    if image_queue is not None:
+        # the image may still be waiting for the worker
+        folders.append(app.config['UPLOAD_STAGING_FOLDER'])
+    # a single unlink() per folder; an already-missing file is fine
+    for folder in folders:
+        try:
+            os.unlink(os.path.join(folder, filename))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            app.logger.warning(f"Failed removing image {filename}: {e}")
+
+
+# init_db() runs once per process, normally from bootstrap() at startup; the request
+# hook below only checks the flag (and covers entrypoints that skip bootstrap())
+_db_ready = False
+_db_lock = threading.Lock()
 
 
 def init_db():
+    """Create missing tables, columns and indexes; raises if the schema can't be set up."""
+    global _db_ready
     ensure_app_dirs()
     # Always attempt to create any missing tables for new models.
     # This is safe: create_all() will not drop existing tables.
     try:
-        # wait for DB to be reachable (useful when deployed with separate DB service)
-        wait_for_db(timeout=30, interval=1)
         with app.app_context():
             db.create_all()
             # ensure post table has user_id column (SQLite doesn't alter columns via create_all)
             try:
-                conn = db.engine.connect()
-                # check if 'user_id' exists on the posts table
-                res = conn.execute("PRAGMA table_info(post);")
-                cols = [row[1] for row in res]
-                if 'user_id' not in cols:
-                    # add nullable column
-                    conn.execute('ALTER TABLE post ADD COLUMN user_id INTEGER;')
-                conn.close()
+                with db.engine.begin() as conn:
+                    # check if 'user_id' exists on the posts table
+                    res = conn.execute(text('PRAGMA table_info(post)'))
+                    cols = [row[1] for row in res]
+                    if 'user_id' not in cols:
+                        # add nullable column
+                        conn.execute(text('ALTER TABLE post ADD COLUMN user_id INTEGER'))
             except Exception:
                 app.logger.debug('Could not run ALTER TABLE to add user_id; skipping')
+            # create_all() skips existing tables, so add indexes declared since the DB was created
+            for index in list(Post.__table__.indexes) + list(Animal.__table__.indexes):
+                try:
+                    index.create(db.engine, checkfirst=True)
+                except Exception as e:
+                    # fatal: create_animal's ON CONFLICT (species_id, name) needs the unique
+                    # index, so duplicate animals must be cleaned up before the app can start
+                    app.logger.error('Could not create index %s: %s', index.name, e)
+                    raise
     except Exception as e:
+        # leave _db_ready unset so the next request (or bootstrap) fails loudly and retries
         app.logger.exception('Error creating DB tables: %s', e)
+        raise
+    _db_ready = True
+
+
+@app.before_request
+def ensure_db_ready():
+    if _db_ready:
+        return
+    with _db_lock:
+        if not _db_ready:
+            init_db()
 
 
 def wait_for_db(timeout=30, interval=1):
     """Wait until the database is reachable or raise RuntimeError."""
-    import time
-    from sqlalchemy.exc import OperationalError
-
     start = time.time()
     while True:
         try:
             # lightweight probe
             with app.app_context():
-                db.session.execute('SELECT 1')
+                db.session.execute(text('SELECT 1'))
             return True
         except OperationalError:
             if time.time() - start > timeout:
@@ -141,11 +320,42 @@ def wait_for_db(timeout=30, interval=1):
             time.sleep(interval)
 
 
+def bootstrap():
+    """Process startup: wait for the database, then create tables and indexes.
+
+    Called from `python app.py` and gunicorn's on_starting hook, never from a request.
+    """
+    wait_for_db(timeout=30, interval=1)
+    init_db()
+    # the gunicorn master must not hand its pooled connections to forked workers
+    with app.app_context():
+        db.engine.dispose()
+
+
+@event.listens_for(Engine, 'handle_error')
+def flag_connect_failures(context):
+    # no connection means the error came from opening one: the database is unreachable.
+    # SQLAlchemy already flags drops of established connections via the dialect.
+    if context.connection is None and isinstance(context.sqlalchemy_exception, OperationalError):
+        context.is_disconnect = True
+
+
+@app.errorhandler(OperationalError)
+def database_unavailable(e):
+    if not e.connection_invalidated:
+        # schema/programming errors (e.g. "no such table") are bugs, not outages
+        app.logger.exception('Database error: %s', e)
+        return InternalServerError(original_exception=e)
+    # fail fast so the load balancer can retry instead of the request hanging
+    app.logger.error('Database unavailable: %s', e)
+    return 'Database temporarily unavailable, please retry shortly.', 503, {'Retry-After': '5'}
+
+
 @app.route('/healthz')
 def healthz():
     try:
         with app.app_context():
-            db.session.execute('SELECT 1')
+            db.session.execute(text('SELECT 1'))
         return {'status': 'ok'}, 200
     except Exception as e:
         app.logger.exception('Health check failed: %s', e)
@@ -156,9 +366,12 @@ def is_editor_logged_in():
     return session.get('editor_logged_in') is True
 
 
-def editor_required(f):
-    from functools import wraps
+def skip_page_cache():
+    """Pages rendered for the editor or carrying flash messages must not be cached."""
+    return is_editor_logged_in() or '_flashes' in session
+
 
+def editor_required(f):
     @wraps(f)
     def decorated(*args, **kwargs):
         if not is_editor_logged_in():
@@ -170,32 +383,33 @@ def editor_required(f):
 
 
 @app.route('/')
+@cache.cached(query_string=True, unless=skip_page_cache)
 def index():
-    init_db()
-    species = Species.query.order_by(Species.name).all()
+    species = get_species_list()
     # optional filter by species
     species_filter = request.args.get('species_id')
+    # eager-load species and user so the template doesn't issue a query per post
+    query = Post.query.options(joinedload(Post.species), joinedload(Post.user))
     if species_filter:
         try:
             sid = int(species_filter)
-            posts = Post.query.filter_by(species_id=sid).order_by(Post.timestamp.desc()).limit(50).all()
+            query = query.filter_by(species_id=sid)
         except ValueError:
-            posts = Post.query.order_by(Post.timestamp.desc()).limit(50).all()
-    else:
-        posts = Post.query.order_by(Post.timestamp.desc()).limit(50).all()
+            pass
+    posts = query.order_by(Post.timestamp.desc()).limit(50).all()
     return render_template('index.html', species=species, posts=posts)
 
 
 @app.route('/login', methods=['GET', 'POST'])
 def login():
-    init_db()
     next_url = request.args.get('next') or url_for('index')
     if request.method == 'POST':
         username = request.form.get('username')
         password = request.form.get('password')
-        editor_user = os.environ.get('EDITOR_USER', 'editor')
-        editor_pass = os.environ.get('EDITOR_PASS', 'password')
-        if username == editor_user and password == editor_pass:
+        # always run the password hash so a wrong username takes as long as a right one
+        user_ok = hmac.compare_digest((username or '').encode(), EDITOR_USER.encode())
+        pass_ok = check_password_hash(EDITOR_PASS_HASH, password or '')
+        if user_ok and pass_ok:
             session['editor_logged_in'] = True
             flash('Logged in as editor.', 'success')
             return redirect(next_url)
@@ -219,22 +433,22 @@ def new_species():
         if not name:
             flash('Species name cannot be empty.', 'warning')
             return redirect(url_for('new_species'))
-        existing = Species.query.filter_by(name=name).first()
-        if existing:
+        species_id = insert_unless_exists(Species, ['name'], name=name)
+        if species_id is None:
+            existing_id = db.session.query(Species.id).filter_by(name=name).scalar()
             flash('Species already exists.', 'info')
-            return redirect(url_for('species_profile', species_id=existing.id))
-        sp = Species(name=name)
-        db.session.add(sp)
+            return redirect(url_for('species_profile', species_id=existing_id))
         db.session.commit()
+        cache.clear()
         flash(f'Species "{name}" added.', 'success')
-        return redirect(url_for('species_profile', species_id=sp.id))
+        return redirect(url_for('species_profile', species_id=species_id))
     return render_template('new_species.html')
 
 
 @app.route('/species/<int:species_id>/edit', methods=['GET', 'POST'])
 @editor_required
 def edit_species(species_id):
-    sp = Species.query.get_or_404(species_id)
+    sp = db.get_or_404(Species, species_id)
     if request.method == 'POST':
         name = request.form.get('name', '').strip()
         if not name:
@@ -242,6 +456,7 @@ def edit_species(species_id):
             return redirect(url_for('edit_species', species_id=sp.id))
         sp.name = name
         db.session.commit()
+        cache.clear()
         flash('Species updated.', 'success')
         return redirect(url_for('species_profile', species_id=sp.id))
     return render_template('edit_species.html', species=sp)
@@ -250,37 +465,53 @@ def edit_species(species_id):
 @app.route('/animals/<int:animal_id>/edit', methods=['GET', 'POST'])
 @editor_required
 def edit_animal(animal_id):
-    a = Animal.query.get_or_404(animal_id)
+    a = db.get_or_404(Animal, animal_id)
     if request.method == 'POST':
         name = request.form.get('name', '').strip()
         if not name:
             flash('Animal name cannot be empty.', 'warning')
             return redirect(url_for('edit_animal', animal_id=a.id))
         a.name = name
-        db.session.commit()
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # unique index on (species_id, name)
+            db.session.rollback()
+            flash('Animal already exists for this species.', 'info')
+            return redirect(url_for('edit_animal', animal_id=animal_id))
+        cache.clear()
         flash('Animal updated.', 'success')
         return redirect(url_for('species_profile', species_id=a.species_id))
     return render_template('edit_animal.html', animal=a)
 
 
+POSTS_PER_PAGE = 50
+
+
 @app.route('/species/<int:species_id>')
+@cache.cached(query_string=True, unless=skip_page_cache)
 def species_profile(species_id):
-    sp = Species.query.get_or_404(species_id)
-    posts = Post.query.filter_by(species_id=sp.id).order_by(Post.timestamp.desc()).all()
+    sp = db.get_or_404(Species, species_id)
+    posts = (
+        Post.query.options(joinedload(Post.user))
+        .filter_by(species_id=sp.id)
+        .order_by(Post.timestamp.desc())
+        .paginate(page=request.args.get('page', 1, type=int), per_page=POSTS_PER_PAGE, error_out=False)
+    )
     return render_template('species.html', species=sp, posts=posts)
 
 
 @app.route('/species')
+@cache.cached(unless=skip_page_cache)
 def species_list():
-    init_db()
-    species = Species.query.order_by(Species.name).all()
+    species = get_species_list()
     return render_template('species_list.html', species=species)
 
 
 @app.route('/post/new', methods=['GET', 'POST'])
 @editor_required
 def new_post():
-    species_list = Species.query.order_by(Species.name).all()
+    species_list = get_species_list()
     users = User.query.order_by(User.name).all()
     # allow pre-selecting a species via query string, e.g. /post/new?species_id=3
     selected_species_id = request.args.get('species_id')
@@ -306,56 +537,81 @@ def new_post():
             flash('Invalid species selection.', 'danger')
             return redirect(url_for('new_post'))
 
-        sp = Species.query.get(species_id)
-        if not sp:
+        # validate optional user
+        user_id_int = None
+        if user_id:
+            try:
+                user_id_int = int(user_id)
+            except ValueError:
+                flash('Invalid user selection.', 'warning')
+                return redirect(url_for('new_post'))
+
+        # check both ids with a single SELECT EXISTS instead of loading the rows
+        species_exists, user_exists = db.session.query(
+            db.session.query(Species.id).filter_by(id=species_id).exists(),
+            db.session.query(User.id).filter_by(id=user_id_int).exists(),
+        ).one()
+        if not species_exists:
             flash('Selected species not found.', 'danger')
             return redirect(url_for('new_post'))
+        if user_id_int is not None and not user_exists:
+            flash('Selected user not found.', 'warning')
+            return redirect(url_for('new_post'))
 
         filename = secure_filename(image.filename)
         if filename == '':
             flash('Invalid image filename.', 'danger')
             return redirect(url_for('new_post'))
 
-        # make filename unique
-        timestamp_str = datetime.utcnow().strftime('%Y%m%d%H%M%S%f')
-        name, ext = os.path.splitext(filename)
-        filename = f"{name}_{timestamp_str}{ext}"
-        dest = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        image.save(dest)
-
-        # validate optional user
-        if user_id:
+        if image_queue is not None:
+            # the worker re-encodes uploads, so reject anything Pillow can't read up front
             try:
-                user_id_int = int(user_id)
-                u = User.query.get(user_id_int)
-                if not u:
-                    flash('Selected user not found.', 'warning')
-                    return redirect(url_for('new_post'))
-            except ValueError:
-                flash('Invalid user selection.', 'warning')
+                with Image.open(image.stream) as img:
+                    img.verify()
+            except (OSError, SyntaxError, Image.DecompressionBombError):
+                flash('Unsupported or damaged image file.', 'danger')
                 return redirect(url_for('new_post'))
-        else:
-            user_id_int = None
-
-        post = Post(
-            caption=caption,
-            animal_name=animal_name,
-            notes=notes,
-            image_filename=filename,
-            species_id=sp.id,
-            user_id=user_id_int,
-        )
-        db.session.add(post)
+            image.stream.seek(0)
+
+        # make filename unique; a random token can't collide between concurrent uploads
+        suffix = secrets.token_hex(8)
+        name, ext = os.path.splitext(filename)
+        filename = f"{name}_{suffix}{ext}"
+        # with a worker the raw upload is staged privately; it is only served once cleaned
+        upload_folder = app.config['UPLOAD_STAGING_FOLDER' if image_queue is not None else 'UPLOAD_FOLDER']
+        image.save(os.path.join(upload_folder, filename))
+
+        # plain Core INSERT: no ORM unit-of-work, only the new id is read back
+        post_id = db.session.execute(
+            insert(Post)
+            .values(
+                caption=caption,
+                animal_name=animal_name,
+                notes=notes,
+                image_filename=filename,
+                species_id=species_id,
+                user_id=user_id_int,
+            )
+            .returning(Post.id)
+        ).scalar()
         db.session.commit()
+        cache.clear()
+        if image_queue is not None:
+            try:
+                image_queue.enqueue(process_image, filename, post_id)
+            except redis.RedisError as e:
+                # the post is saved; its image stays staged until
+                # scripts/requeue_staged_images.py is run once Redis is back
+                app.logger.warning(f"Could not queue processing for {filename}: {e}")
         flash('Post created.', 'success')
-        return redirect(url_for('species_profile', species_id=sp.id))
+        return redirect(url_for('species_profile', species_id=species_id))
 
     return render_template('new_post.html', species_list=species_list, users=users, selected_species_id=selected_species_id)
 
 
 @app.route('/users')
+@cache.cached(unless=skip_page_cache)
 def users_list():
-    init_db()
     users = User.query.order_by(User.name).all()
     return render_template('users.html', users=users)
 
@@ -369,89 +625,140 @@ def new_user():
         if not name:
             flash('Name is required', 'warning')
             return redirect(url_for('new_user'))
-        u = User(name=name, bio=bio)
-        db.session.add(u)
+        db.session.execute(insert(User).values(name=name, bio=bio))
         db.session.commit()
+        cache.clear()
         flash('User created.', 'success')
         return redirect(url_for('users_list'))
     return render_template('new_user.html')
 
 
+@cache.memoize()
+def get_animals_for_species(species_id):
+    # plain (id, name) rows from the (species_id, name) index; no Species/Animal objects
+    rows = (
+        db.session.query(Animal.id, Animal.name)
+        .filter_by(species_id=species_id)
+        .order_by(Animal.name)
+        .all()
+    )
+    return [{'id': animal_id, 'name': name} for animal_id, name in rows]
+
+
 @app.route('/species/<int:species_id>/animals', methods=['GET'])
 def list_animals_for_species(species_id):
-    sp = Species.query.get_or_404(species_id)
-    animals = [{'id': a.id, 'name': a.name} for a in sp.animals]
-    from flask import jsonify
-    return jsonify(animals)
+    resp = jsonify(get_animals_for_species(species_id))
+    # browsers revalidate with If-None-Match and get a 304 while the list is unchanged
+    resp.cache_control.no_cache = True
+    resp.add_etag()
+    return resp.make_conditional(request)
 
 
 @app.route('/species/<int:species_id>/animals/new', methods=['POST'])
 @editor_required
 def create_animal(species_id):
-    sp = Species.query.get_or_404(species_id)
+    sp = db.get_or_404(Species, species_id)
     name = request.form.get('name', '').strip()
     if not name:
         flash('Animal name cannot be empty.', 'warning')
         return redirect(url_for('species_profile', species_id=sp.id))
-    # avoid duplicates per species
-    existing = Animal.query.filter_by(species_id=sp.id, name=name).first()
-    if existing:
+    # avoid duplicates per species (unique index on species_id, name)
+    if insert_unless_exists(Animal, ['species_id', 'name'], species_id=sp.id, name=name) is None:
         flash('Animal already exists for this species.', 'info')
         return redirect(url_for('species_profile', species_id=sp.id))
-    a = Animal(name=name, species_id=sp.id)
-    db.session.add(a)
     db.session.commit()
+    cache.clear()
     flash(f'Animal "{name}" added to {sp.name}.', 'success')
     return redirect(url_for('species_profile', species_id=sp.id))
 
 
+UPLOAD_MAX_AGE = 365 * 24 * 60 * 60  # one year
+
+
 @app.route('/uploads/<path:filename>')
 def uploaded_file(filename):
-    return send_from_directory(app.config['UPLOAD_FOLDER'], filename)
+    accel_prefix = app.config['UPLOADS_ACCEL_REDIRECT']
+    if accel_prefix:
+        # behind nginx: return only a header and let nginx sendfile() the image
+        path = safe_join(app.config['UPLOAD_FOLDER'], filename)
+        if path is None:
+            abort(404)
+        if not os.path.isfile(path):
+            # nginx passes our Cache-Control through, so check here rather than let
+            # a not-yet-published image become a year-long cached 404
+            return 'Not Found', 404, {'Cache-Control': 'no-store'}
+        response = Response()
+        response.headers['X-Accel-Redirect'] = accel_prefix.rstrip('/') + '/' + quote(filename)
+        # empty Content-Type lets nginx pick one from the file extension
+        response.headers['Content-Type'] = ''
+    else:
+        try:
+            response = send_from_directory(app.config['UPLOAD_FOLDER'], filename)
+        except NotFound:
+            # likely still waiting for the image worker; don't let a CDN remember the 404
+            return 'Not Found', 404, {'Cache-Control': 'no-store'}
+    # files are written to the upload folder once, in final form (the worker stages raw
+    # uploads elsewhere), and names are unique per post, so a URL never changes content
+    response.cache_control.no_cache = False
+    response.cache_control.public = True
+    response.cache_control.max_age = UPLOAD_MAX_AGE
+    response.cache_control.immutable = True
+    return response
 
 
 @app.route('/post/<int:post_id>/delete', methods=['POST'])
 @editor_required
 def delete_post(post_id):
-    post = Post.query.get_or_404(post_id)
-    # remove image file if exists
-    try:
-        if post.image_filename:
-            path = os.path.join(app.config['UPLOAD_FOLDER'], post.image_filename)
-            if os.path.exists(path):
-                os.remove(path)
-    except Exception as e:
-        app.logger.warning(f"Failed removing image for post {post_id}: {e}")
-
+    post = db.get_or_404(Post, post_id)
+    image_filename = post.image_filename
     db.session.delete(post)
     db.session.commit()
+    cache.clear()
+    # remove image file if exists
+    if image_filename:
+        remove_upload(image_filename)
     flash('Post deleted.', 'info')
     # redirect to species page if possible
     return redirect(url_for('index'))
 
 
+DELETE_BATCH_SIZE = 500
+
+
 @app.route('/species/<int:species_id>/delete', methods=['POST'])
 @editor_required
 def delete_species(species_id):
-    sp = Species.query.get_or_404(species_id)
-    # delete posts and their images
-    posts = Post.query.filter_by(species_id=sp.id).all()
-    for p in posts:
-        try:
-            if p.image_filename:
-                path = os.path.join(app.config['UPLOAD_FOLDER'], p.image_filename)
-                if os.path.exists(path):
-                    os.remove(path)
-        except Exception as e:
-            app.logger.warning(f"Failed removing image for post {p.id}: {e}")
-        db.session.delete(p)
-
+    sp = db.get_or_404(Species, species_id)
+    # delete posts in batches so memory stays bounded however many posts the species has;
+    # only the ids and filenames are needed, not full Post rows. Each commit expires sp,
+    # so the loop filters on species_id rather than reloading it.
+    while True:
+        posts = (
+            Post.query.filter_by(species_id=species_id)
+            .with_entities(Post.id, Post.image_filename)
+            .limit(DELETE_BATCH_SIZE)
+            .all()
+        )
+        if not posts:
+            break
+        # one DELETE per batch instead of one per row
+        db.session.execute(Post.__table__.delete().where(Post.id.in_([post_id for post_id, _ in posts])))
+        db.session.commit()
+        # clear per batch so a later failure doesn't leave deleted posts on cached pages
+        cache.clear()
+        # remove images once their rows are gone
+        for _, image_filename in posts:
+            if image_filename:
+                remove_upload(image_filename)
+    db.session.execute(Animal.__table__.delete().where(Animal.species_id == species_id))
     db.session.delete(sp)
     db.session.commit()
+    cache.clear()
     flash('Species and its posts were deleted.', 'info')
     return redirect(url_for('index'))
 
 
 if __name__ == '__main__':
-    init_db()
-    app.run(debug=True)
+    # local development server only; production runs under gunicorn (see gunicorn.conf.py)
+    bootstrap()
+    app.run(debug=os.environ.get('FLASK_DEBUG', '1') in ('1', 'true', 'True'))
@@ -0,0 +1,6 @@
+"""ASGI entrypoint for uvicorn: `uvicorn asgi:app` (needs `pip install uvicorn asgiref`)."""
+from asgiref.wsgi import WsgiToAsgi
+
+from app import app as flask_app
+
+app = WsgiToAsgi(flask_app)
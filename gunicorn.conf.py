@@ -0,0 +1,23 @@
+"""Gunicorn settings for production (used by the Dockerfile)."""
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+
+# The app is I/O bound (DB queries, image uploads) so gevent workers let each
+# process multiplex many connections instead of blocking one request at a time.
+worker_class = 'gevent'
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 1000))
+
+# Import the app once in the master so workers share its memory after fork
+preload_app = True
+
+accesslog = '-'
+errorlog = '-'
+
+
+def on_starting(server):
+    # wait for the database and create tables once in the master, before workers fork
+    from app import bootstrap
+    bootstrap()
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""One-off migration: add the post/animal indexes to an existing database."""
+import sqlite3
+import os
+
+DB = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'app.db')
+
+INDEXES = [
+    'CREATE INDEX IF NOT EXISTS ix_post_timestamp ON post (timestamp);',
+    'CREATE INDEX IF NOT EXISTS ix_post_species_ts ON post (species_id, timestamp);',
+    'CREATE UNIQUE INDEX IF NOT EXISTS uq_animal_species_name ON animal (species_id, name);',
+]
+
+if not os.path.exists(DB):
+    print('No database file found at', DB)
+    raise SystemExit(1)
+
+conn = sqlite3.connect(DB)
+cur = conn.cursor()
+try:
+    for stmt in INDEXES:
+        print('Running:', stmt)
+        cur.execute(stmt)
+    conn.commit()
+    print('Indexes in place.')
+except sqlite3.IntegrityError as e:
+    print('Migration failed (duplicate animal names per species?):', e)
+    raise
+except Exception as e:
+    print('Migration failed:', e)
+    raise
+finally:
+    conn.close()
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""Re-enqueue processing for every staged upload whose post still exists.
+
+Run this after a Redis outage: posts saved while the queue was unreachable keep
+their raw image in uploads_staging/ until a worker publishes it.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import Post, app, db, image_queue  # noqa: E402
+from tasks import process_image  # noqa: E402
+
+if image_queue is None:
+    print('REDIS_URL is not set; there is no image queue to requeue to.')
+    raise SystemExit(1)
+
+staging = app.config['UPLOAD_STAGING_FOLDER']
+staged = set(os.listdir(staging)) if os.path.isdir(staging) else set()
+if not staged:
+    print('No staged images.')
+    raise SystemExit(0)
+
+with app.app_context():
+    posts = (
+        db.session.query(Post.id, Post.image_filename)
+        .filter(Post.image_filename.in_(staged))
+        .all()
+    )
+
+for post_id, filename in posts:
+    image_queue.enqueue(process_image, filename, post_id)
+    print('Queued', filename, 'for post', post_id)
+
+# not deleted here: an upload in progress is staged before its post is committed
+for filename in sorted(staged - {filename for _, filename in posts}):
+    print('No post for staged file', filename)
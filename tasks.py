@@ -0,0 +1,68 @@
+"""Background jobs run by the RQ worker: `rq worker images` (needs REDIS_URL)."""
+import os
+
+from PIL import ExifTags, Image, ImageOps
+
+# longest edge kept for uploaded photos; larger originals are downscaled
+MAX_IMAGE_SIZE = 2048
+# JPEG quality used when the pixels have to be re-encoded (rotate/resize)
+JPEG_QUALITY = 90
+
+
+def process_image(filename, post_id):
+    """Publish a staged upload: apply EXIF orientation, strip metadata and downscale.
+
+    The raw upload sits in the (non-public) staging folder until this job writes the
+    cleaned image under the upload folder, so the original is never served.
+    """
+    # imported lazily: app.py imports this module for the enqueue call
+    from app import Post, app, db
+
+    staging_path = os.path.join(app.config['UPLOAD_STAGING_FOLDER'], filename)
+    final_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+
+    with app.app_context():
+        post_exists = db.session.get(Post, post_id) is not None
+    if not post_exists:
+        # post was deleted before the job ran; nothing to publish
+        _unlink_if_exists(staging_path)
+        return
+    if not os.path.exists(staging_path):
+        return
+
+    root, ext = os.path.splitext(final_path)
+    tmp_path = f"{root}.processing{ext}"
+    try:
+        with Image.open(staging_path) as img:
+            fmt = img.format
+            save_kwargs = {}
+            if img.info.get('icc_profile'):
+                save_kwargs['icc_profile'] = img.info['icc_profile']
+            orientation = img.getexif().get(ExifTags.Base.Orientation, 1)
+            if orientation != 1 or max(img.size) > MAX_IMAGE_SIZE:
+                out = ImageOps.exif_transpose(img)
+                out.thumbnail((MAX_IMAGE_SIZE, MAX_IMAGE_SIZE))
+                if fmt == 'JPEG':
+                    save_kwargs['quality'] = JPEG_QUALITY
+            else:
+                # pixels unchanged: only metadata is dropped; keep the original JPEG tables
+                out = img
+                if fmt == 'JPEG':
+                    save_kwargs['quality'] = 'keep'
+            # write next to the final file and swap, so readers never see a partial file
+            out.save(tmp_path, format=fmt, **save_kwargs)
+        os.replace(tmp_path, final_path)
+    except OSError as e:
+        # unreadable or truncated image (UnidentifiedImageError is an OSError); retrying
+        # won't help, so log it and drop the staged file instead of keeping it forever
+        app.logger.error(f"Could not process {filename} for post {post_id}: {e}")
+    finally:
+        _unlink_if_exists(tmp_path)
+    _unlink_if_exists(staging_path)
+
+
+def _unlink_if_exists(path):
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,15 @@
+"""WSGI entrypoint for gunicorn: `gunicorn -c gunicorn.conf.py wsgi:app`."""
+# gevent must patch the stdlib before anything else imports socket/threading
+from gevent import monkey
+
+monkey.patch_all()
+
+# make psycopg2 yield to other greenlets while waiting on Postgres
+try:
+    from psycogreen.gevent import patch_psycopg
+    patch_psycopg()
+except ImportError:
+    # psycopg2/psycogreen are only needed when DATABASE_URL points at Postgres
+    pass
+
+from app import app  # noqa: E402